@@ -6,8 +6,11 @@ Usage:
     python scripts/standalone_pdf_converter.py notes.md
     python scripts/standalone_pdf_converter.py notes.md -o output.pdf
     python scripts/standalone_pdf_converter.py input_dir/ --batch
+    python scripts/standalone_pdf_converter.py input_dir/ --batch --workers 4
+    python scripts/standalone_pdf_converter.py input_dir/ --batch -o combined.pdf
 """
 
+import os
 import sys
 import argparse
 from pathlib import Path
@@ -15,7 +18,7 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from pdf_generator import PDFGenerator
+from pdf_generator import PARSERS, PDFGenerator
 
 def main():
     parser = argparse.ArgumentParser(
@@ -27,38 +30,61 @@ def main():
     )
     parser.add_argument(
         '-o', '--output',
-        help='Output PDF path (auto-generated if not specified)'
+        help='Output PDF path (auto-generated if not specified); '
+             'with --batch, combine all files into this one PDF'
     )
     parser.add_argument(
         '--batch',
         action='store_true',
         help='Batch convert all .md files in directory'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Parallel worker processes for --batch (default: CPU count)'
+    )
+    parser.add_argument(
+        '--parser',
+        choices=PARSERS,
+        default='markdown',
+        help='Markdown parser (markdown-it is faster, needs markdown-it-py)'
+    )
 
     args = parser.parse_args()
 
     input_path = Path(args.input)
-    generator = PDFGenerator()
 
     if args.batch:
         if not input_path.is_dir():
             print(f"Error: {input_path} is not a directory")
             sys.exit(1)
 
-        md_files = list(input_path.glob('*.md'))
+        md_files = sorted(
+            Path(entry.path) for entry in os.scandir(input_path)
+            if entry.name.endswith('.md') and entry.is_file(follow_symlinks=False)
+        )
         if not md_files:
             print(f"No .md files found in {input_path}")
             sys.exit(1)
 
-        print(f"Converting {len(md_files)} Markdown files to PDF...\n")
-
-        for md_file in md_files:
-            print(f"Converting: {md_file.name}")
-            pdf_path = generator.generate_pdf(md_file)
+        if args.output:
+            pdf_path = PDFGenerator(parser=args.parser).generate_many(md_files, Path(args.output))
             if pdf_path:
-                print(f"  ✓ Saved: {pdf_path.name}\n")
+                print(f"✓ Combined PDF saved: {pdf_path}")
             else:
-                print(f"  ✗ Failed\n")
+                print("✗ PDF generation failed")
+                sys.exit(1)
+            return
+
+        print(f"Converting {len(md_files)} Markdown files to PDF...\n")
+
+        # One status write per file, reported as soon as that file is converted
+        results = PDFGenerator(parser=args.parser).generate_batch(md_files, workers=args.workers)
+        for md_file, pdf_path in zip(md_files, results):
+            status = f"✓ Saved: {pdf_path.name}" if pdf_path else "✗ Failed"
+            sys.stdout.write(f"Converting: {md_file.name}\n  {status}\n\n")
+            sys.stdout.flush()
 
     else:
         if not input_path.exists():
@@ -68,7 +94,7 @@ def main():
         output_path = Path(args.output) if args.output else None
 
         print(f"Converting {input_path.name} to PDF...")
-        pdf_path = generator.generate_pdf(input_path, output_path)
+        pdf_path = PDFGenerator(parser=args.parser).generate_pdf(input_path, output_path)
 
         if pdf_path:
             print(f"✓ PDF saved: {pdf_path}")
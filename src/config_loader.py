@@ -4,7 +4,18 @@
 import yaml
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Set
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Parsed YAML trees keyed by (resolved path, mtime, size); Config never mutates them
+_YAML_CACHE: Dict[tuple, dict] = {}
+
+# Directories (and their parents) already created by this process
+_CREATED_DIRS: Set[str] = set()
 
 class Config:
     """Configuration manager for Language Learner"""
@@ -21,24 +32,34 @@ class Config:
                 "Please copy config/config.example.yaml to config/config.yaml and customize it."
             )
 
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.data = yaml.safe_load(f)
+        self.path = Path(config_path)
+
+        st = os.stat(config_path)
+        key = (str(Path(config_path).resolve()), st.st_mtime_ns, st.st_size)
+        self.data = _YAML_CACHE.get(key)
+        if self.data is None:
+            # Raw bytes: PyYAML detects the encoding and decodes in libyaml
+            self.data = yaml.load(Path(config_path).read_bytes(), Loader=SafeLoader)
+            _YAML_CACHE[key] = self.data
+
+        self._flat = self._flatten(self.data) if isinstance(self.data, dict) else {}
+
+    @staticmethod
+    def _flatten(data: dict, prefix: str = '') -> Dict[str, Any]:
+        """Map every dotted path (e.g., 'course.name') to its non-null value"""
+        flat = {}
+        for k, value in data.items():
+            if not isinstance(k, str) or value is None:
+                continue
+            path = prefix + k
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(Config._flatten(value, path + '.'))
+        return flat
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation (e.g., 'course.name')"""
-        keys = key.split('.')
-        value = self.data
-
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return default
-
-            if value is None:
-                return default
-
-        return value
+        return self._flat.get(key, default)
 
     def __getitem__(self, key: str) -> Any:
         """Allow dict-like access"""
@@ -56,6 +77,16 @@ class Config:
     def native_language(self) -> str:
         return self.get('language.native_language', 'en')
 
+    @property
+    def lessons(self) -> List[Dict[str, Any]]:
+        """Lessons of every enabled source, in config order ('sources' is a list, so get() can't reach them)"""
+        return [
+            lesson
+            for source in self.get('sources', [])
+            if isinstance(source, dict) and source.get('enabled', True)
+            for lesson in source.get('lessons') or []
+        ]
+
     @property
     def output_dir(self) -> Path:
         return Path(self.get('output.directory', 'output'))
@@ -70,6 +101,8 @@ class Config:
 
     def create_output_dirs(self):
         """Create necessary output directories"""
-        self.output_dir.mkdir(exist_ok=True)
-        self.transcripts_dir.mkdir(exist_ok=True)
-        self.audio_dir.mkdir(exist_ok=True)
+        # Subdirectories first so parents=True also creates output_dir
+        for path in (self.transcripts_dir, self.audio_dir, self.output_dir):
+            if str(path) not in _CREATED_DIRS:
+                path.mkdir(parents=True, exist_ok=True)
+                _CREATED_DIRS.update(str(p) for p in (path, *path.parents))
@@ -5,19 +5,56 @@ Video downloader supporting multiple sources
 
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Set, Tuple
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Only the tail of a failing command's stderr is kept for the error log
+STDERR_TAIL_BYTES = 65536
+
+# Output directories already created by this process
+_CREATED_DIRS: Set[str] = set()
+
+# Flags applied to every yt-dlp call; fragment concurrency is appended per downloader.
+# Downloads keep the default .part file so an interrupted one is never taken as complete
+YTDLP_FLAGS = ["--no-progress", "--quiet", "--retries", "3"]
+
 class VideoDownloader:
     """Download videos from various sources"""
 
-    def __init__(self, output_dir: Path):
+    def __init__(self, output_dir: Path, max_workers: int = 4, concurrent_fragments: int = 4):
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
+        self.max_workers = max(1, max_workers)
+        self.concurrent_fragments = max(1, concurrent_fragments)
+        if (key := str(self.output_dir)) not in _CREATED_DIRS:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            _CREATED_DIRS.add(key)
+
+    @staticmethod
+    def _run(cmd: List[str]) -> Tuple[int, str]:
+        """Run a download command, discarding stdout and decoding stderr only on failure"""
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        tail = b""
+        with proc.stderr:
+            for chunk in iter(lambda: proc.stderr.read(STDERR_TAIL_BYTES), b""):
+                tail = (tail + chunk)[-STDERR_TAIL_BYTES:]
+        returncode = proc.wait()
+
+        if returncode != 0:
+            return returncode, tail.decode('utf-8', errors='replace')
+        return returncode, ""
+
+    def _ytdlp_cmd(self, url: str, output_path: Path) -> List[str]:
+        """Build a yt-dlp command with the shared tuning flags"""
+        return [
+            "yt-dlp", url, "-o", str(output_path),
+            *YTDLP_FLAGS,
+            "--concurrent-fragments", str(self.concurrent_fragments),
+        ]
 
     def download_google_drive(self, file_id: str, output_filename: str) -> bool:
         """Download from Google Drive using yt-dlp"""
@@ -27,11 +64,11 @@ class VideoDownloader:
 
             logger.info(f"Downloading from Google Drive: {output_filename}")
 
-            cmd = ["yt-dlp", url, "-o", str(output_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            cmd = self._ytdlp_cmd(url, output_path)
+            returncode, stderr = self._run(cmd)
 
-            if result.returncode != 0:
-                logger.error(f"Download failed: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"Download failed: {stderr}")
                 return False
 
             logger.info(f"✓ Downloaded: {output_filename}")
@@ -49,11 +86,11 @@ class VideoDownloader:
 
             logger.info(f"Downloading from YouTube: {output_filename}")
 
-            cmd = ["yt-dlp", url, "-o", str(output_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            cmd = self._ytdlp_cmd(url, output_path)
+            returncode, stderr = self._run(cmd)
 
-            if result.returncode != 0:
-                logger.error(f"Download failed: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"Download failed: {stderr}")
                 return False
 
             logger.info(f"✓ Downloaded: {output_filename}")
@@ -70,16 +107,16 @@ class VideoDownloader:
 
             logger.info(f"Downloading from URL: {output_filename}")
 
-            cmd = ["yt-dlp", url, "-o", str(output_path)]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            cmd = self._ytdlp_cmd(url, output_path)
+            returncode, stderr = self._run(cmd)
 
-            if result.returncode != 0:
+            if returncode != 0:
                 # Fallback to curl
-                cmd = ["curl", "-L", url, "-o", str(output_path)]
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                cmd = ["curl", "-sS", "-L", url, "-o", str(output_path)]
+                returncode, stderr = self._run(cmd)
 
-                if result.returncode != 0:
-                    logger.error(f"Download failed: {result.stderr}")
+                if returncode != 0:
+                    logger.error(f"Download failed: {stderr}")
                     return False
 
             logger.info(f"✓ Downloaded: {output_filename}")
@@ -89,34 +126,39 @@ class VideoDownloader:
             logger.error(f"Error downloading {output_filename}: {e}")
             return False
 
+    def check_local(self, filename: str) -> bool:
+        """Verify a local file exists in the output directory"""
+        if (self.output_dir / filename).exists():
+            logger.info(f"✓ Found local file: {filename}")
+            return True
+
+        logger.warning(f"✗ Local file not found: {filename}")
+        return False
+
     def download_lessons(self, lessons: List[Dict], source_type: str) -> List[str]:
-        """Download multiple lessons"""
-        downloaded_files = []
+        """Download multiple lessons concurrently, returning files in lesson order"""
+        jobs = []
 
         for lesson in lessons:
             filename = lesson.get('filename')
 
             if source_type == 'google_drive':
-                file_id = lesson.get('id')
-                if self.download_google_drive(file_id, filename):
-                    downloaded_files.append(filename)
+                jobs.append((filename, self.download_google_drive, (lesson.get('id'), filename)))
 
             elif source_type == 'youtube':
-                video_id = lesson.get('id')
-                if self.download_youtube(video_id, filename):
-                    downloaded_files.append(filename)
+                jobs.append((filename, self.download_youtube, (lesson.get('id'), filename)))
 
             elif source_type == 'url':
-                url = lesson.get('url')
-                if self.download_url(url, filename):
-                    downloaded_files.append(filename)
+                jobs.append((filename, self.download_url, (lesson.get('url'), filename)))
 
             elif source_type == 'local':
-                # Just verify file exists
-                if (self.output_dir / filename).exists():
-                    downloaded_files.append(filename)
-                    logger.info(f"✓ Found local file: {filename}")
-                else:
-                    logger.warning(f"✗ Local file not found: {filename}")
-
-        return downloaded_files
+                jobs.append((filename, self.check_local, (filename,)))
+
+        succeeded = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(func, *args): filename for filename, func, args in jobs}
+            for future in as_completed(futures):
+                if future.result():
+                    succeeded.add(futures[future])
+
+        return [filename for filename, _, _ in jobs if filename in succeeded]
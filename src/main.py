@@ -5,8 +5,11 @@ Automates: Download → Transcribe → Generate Notes
 """
 
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
 import logging
 
 from config_loader import Config
@@ -18,6 +21,57 @@ from progress_tracker import ProgressTracker
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Per-process state for lesson workers
+_worker_transcriber = None
+
+def process_lesson(video_path: Path, audio_path: Path, transcript_path: Path,
+                   json_path: Path, model: str, language: Optional[str],
+                   extract_audio: bool = True, keep_video: bool = True,
+                   keep_audio: bool = True, transcriber: Optional[Transcriber] = None,
+                   transcribe: bool = True):
+    """Process a single lesson: extract audio and transcribe
+
+    Takes only picklable arguments so it can run in a process pool; without
+    an explicit transcriber, one is loaded once per worker process. With
+    transcribe=False only the MP3 is extracted (no model is loaded) and the
+    lesson is finished later by a call with transcribe=True.
+    """
+    global _worker_transcriber
+    if transcriber is None:
+        if (_worker_transcriber is None
+                or (_worker_transcriber.model_name, _worker_transcriber.language) != (model, language)):
+            _worker_transcriber = Transcriber(model=model, language=language)
+        transcriber = _worker_transcriber
+
+    # Extract audio: an MP3 is only written when it is kept, otherwise the
+    # samples are piped from ffmpeg straight into Whisper
+    samples = None
+    if extract_audio and not audio_path.exists():
+        if keep_audio:
+            if not transcriber.extract_audio(video_path, audio_path):
+                logger.error(f"Failed to extract audio from {video_path.name}")
+                return
+        elif not transcribe:
+            # Samples are decoded by whoever transcribes the lesson
+            return
+        elif not transcript_path.exists():
+            samples = transcriber.load_pcm(video_path)
+            if samples is None:
+                logger.error(f"Failed to extract audio from {video_path.name}")
+                return
+
+    if not transcribe:
+        return
+
+    # Transcribe
+    if not transcript_path.exists():
+        transcriber.transcribe(audio_path, transcript_path, json_path, audio=samples)
+
+    # Cleanup
+    if not keep_video:
+        video_path.unlink()
+        logger.info(f"✓ Cleaned up: {video_path.name}")
+
 class LanguageLearner:
     """Main processor for language learning materials"""
 
@@ -25,6 +79,21 @@ class LanguageLearner:
         self.config = Config(config_path)
         self.config.create_output_dirs()
         self.progress = ProgressTracker(self.config.output_dir / "progress.json")
+        self._transcriber = None
+        self._transcriber_key = None
+        self._notes_filename = None
+
+    @property
+    def transcriber(self) -> Transcriber:
+        """Shared transcriber so the Whisper model is loaded once per run"""
+        key = (
+            self.config.get('transcription.model', 'medium'),
+            self.config.get('language.code')
+        )
+        if self._transcriber is None or self._transcriber_key != key:
+            self._transcriber = Transcriber(model=key[0], language=key[1])
+            self._transcriber_key = key
+        return self._transcriber
 
     def process_all(self):
         """Main processing pipeline"""
@@ -32,26 +101,44 @@ class LanguageLearner:
         logger.info(f"Language Learner - {self.config.course_name}")
         logger.info("="*70)
 
-        # Step 1: Download videos
-        if self.config.get('sources'):
-            self._download_videos()
-
-        # Step 2: Extract audio and transcribe
-        lessons = self.config.get('sources.0.lessons', [])
+        lessons = self.config.lessons
+        pending = []
         for lesson in lessons:
             filename = lesson.get('filename')
-            date = lesson.get('date')
 
             if self.progress.is_completed(f"transcribe_{filename}"):
                 logger.info(f"✓ Already processed: {filename}")
                 continue
 
-            self._process_lesson(filename, date)
-            self.progress.mark_completed(f"transcribe_{filename}")
+            pending.append(lesson)
+
+        if lessons and not pending and self.progress.is_completed("generate_notes"):
+            logger.info("✓ Nothing to do: all lessons transcribed and notes generated")
+            return
+
+        # Step 1: Download videos (not needed once every lesson is transcribed)
+        if self.config.get('sources') and (pending or not lessons):
+            self._download_videos()
+
+        # Step 2: Extract audio and transcribe
+        # Progress is written once after the loop; finished lessons are also
+        # skipped on resume because their transcript files already exist
+        workers = self._lesson_workers(len(pending))
+        with self.progress.batched():
+            if workers > 1:
+                self._process_lessons_parallel([l.get('filename') for l in pending], workers)
+            else:
+                for lesson in pending:
+                    filename = lesson.get('filename')
+                    self._process_lesson(filename, lesson.get('date'))
+                    self.progress.mark_completed(f"transcribe_{filename}")
 
         # Step 3: Generate comprehensive notes
         if not self.progress.is_completed("generate_notes"):
-            self._generate_notes()
+            if self._notes_up_to_date(lessons):
+                logger.info("✓ Notes are newer than the config and all transcripts, skipping generation")
+            else:
+                self._generate_notes()
             self.progress.mark_completed("generate_notes")
 
         logger.info("\n" + "="*70)
@@ -63,7 +150,11 @@ class LanguageLearner:
         """Download all videos from configured sources"""
         logger.info("\n📥 Downloading videos...")
 
-        downloader = VideoDownloader(self.config.output_dir)
+        downloader = VideoDownloader(
+            self.config.output_dir,
+            max_workers=self.config.get('processing.download_workers', 4),
+            concurrent_fragments=self.config.get('processing.ytdlp_concurrent_fragments', 4)
+        )
 
         for source in self.config.get('sources', []):
             if not source.get('enabled', True):
@@ -75,40 +166,51 @@ class LanguageLearner:
             downloaded = downloader.download_lessons(lessons, source_type)
             logger.info(f"✓ Downloaded {len(downloaded)} files from {source_type}")
 
+    def _lesson_args(self, video_filename: str) -> tuple:
+        """Build the picklable process_lesson() arguments for one lesson"""
+        stem = Path(video_filename).stem
+        return (
+            self.config.output_dir / video_filename,
+            self.config.audio_dir / f"{stem}.mp3",
+            self.config.transcripts_dir / f"{stem}.txt",
+            self.config.transcripts_dir / f"{stem}.json",
+            self.config.get('transcription.model', 'medium'),
+            self.config.get('language.code'),
+            self.config.get('processing.extract_audio', True),
+            self.config.get('processing.keep_video', True),
+            self.config.get('processing.keep_audio', True),
+        )
+
+    def _lesson_workers(self, pending: int) -> int:
+        """Number of lesson worker processes (1 means process in-line)"""
+        if pending < 2 or not self.config.get('advanced.parallel_processing', False):
+            return 1
+        workers = self.config.get('processing.parallel_lessons', max(1, (os.cpu_count() or 2) // 2))
+        return max(1, min(workers, pending))
+
     def _process_lesson(self, video_filename: str, date: str):
         """Process a single lesson: extract audio and transcribe"""
-        video_path = self.config.output_dir / video_filename
-        audio_filename = video_filename.replace('.mp4', '.mp3')
-        audio_path = self.config.audio_dir / audio_filename
-
-        transcript_filename = video_filename.replace('.mp4', '.txt')
-        transcript_path = self.config.transcripts_dir / transcript_filename
-        json_path = self.config.transcripts_dir / video_filename.replace('.mp4', '.json')
-
-        # Extract audio
-        if self.config.get('processing.extract_audio', True):
-            transcriber = Transcriber(
-                model=self.config.get('transcription.model', 'medium'),
-                language=self.config.get('language.code')
-            )
-
-            if not audio_path.exists():
-                if not transcriber.extract_audio(video_path, audio_path):
-                    logger.error(f"Failed to extract audio from {video_filename}")
-                    return
-
-        # Transcribe
-        if not transcript_path.exists():
-            transcriber = Transcriber(
-                model=self.config.get('transcription.model', 'medium'),
-                language=self.config.get('language.code')
-            )
-            transcriber.transcribe(audio_path, transcript_path, json_path)
-
-        # Cleanup
-        if not self.config.get('processing.keep_video', True):
-            video_path.unlink()
-            logger.info(f"✓ Cleaned up: {video_filename}")
+        process_lesson(*self._lesson_args(video_filename), transcriber=self.transcriber)
+
+    def _process_lessons_parallel(self, filenames: list, workers: int):
+        """Process lessons in a pool of worker processes"""
+        logger.info(f"Processing {len(filenames)} lessons with {workers} workers...")
+
+        # Single GPU: workers only extract audio and every lesson is transcribed here,
+        # so one Whisper model is loaded instead of one per worker
+        serialize = self.config.get('processing.serialize_transcription', False)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(process_lesson, *self._lesson_args(filename), transcribe=not serialize): filename
+                for filename in filenames
+            }
+            for future in as_completed(futures):
+                filename = futures[future]
+                future.result()
+                if serialize:
+                    self._process_lesson(filename, None)
+                self.progress.mark_completed(f"transcribe_{filename}")
 
     def _generate_notes(self):
         """Generate comprehensive study notes"""
@@ -122,14 +224,43 @@ class LanguageLearner:
 
         logger.info(f"✓ Notes generated: {notes_filename}")
 
+    def _notes_up_to_date(self, lessons: list) -> bool:
+        """Check whether the notes (and PDF, if enabled) are newer than the config and every lesson transcript"""
+        notes_path = self.config.output_dir / self._get_notes_filename()
+        try:
+            notes_mtime = notes_path.stat().st_mtime_ns
+            # Course details and notes.* options change the notes without touching any transcript
+            if self.config.path.stat().st_mtime_ns > notes_mtime:
+                return False
+            # The PDF is written after the notes, so an older or missing one is stale
+            if self.config.get('notes.generate_pdf', True):
+                if notes_path.with_suffix('.pdf').stat().st_mtime_ns < notes_mtime:
+                    return False
+        except FileNotFoundError:
+            return False
+
+        found = False
+        for lesson in lessons:
+            json_path = self.config.transcripts_dir / f"{Path(lesson.get('filename', '')).stem}.json"
+            try:
+                if json_path.stat().st_mtime_ns > notes_mtime:
+                    return False
+            except FileNotFoundError:
+                continue
+            found = True
+
+        return found
+
     def _get_notes_filename(self) -> str:
         """Get formatted notes filename"""
-        template = self.config.get('output.notes_filename',
-                                  'Comprehensive_Notes_{language}_{level}.md')
-        return template.format(
-            language=self.config.get('course.language', 'Language'),
-            level=self.config.get('course.level', 'A1')
-        ).replace(' ', '_')
+        if self._notes_filename is None:
+            template = self.config.get('output.notes_filename',
+                                      'Comprehensive_Notes_{language}_{level}.md')
+            self._notes_filename = template.format(
+                language=self.config.get('course.language', 'Language'),
+                level=self.config.get('course.level', 'A1')
+            ).replace(' ', '_')
+        return self._notes_filename
 
 def main():
     """Command-line interface"""
@@ -165,7 +296,7 @@ def main():
         if args.download_only:
             learner._download_videos()
         elif args.transcribe_only:
-            lessons = learner.config.get('sources.0.lessons', [])
+            lessons = learner.config.lessons
             for lesson in lessons:
                 learner._process_lesson(lesson['filename'], lesson['date'])
         elif args.notes_only:
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache for rendered Markdown
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rendered HTML kept in memory for the current process
+_MEMORY_CACHE_SIZE = 64
+_memory_cache: "OrderedDict[str, str]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+# Rendered HTML files kept per cache directory; older entries are pruned on write
+# (generated notes carry a timestamp, so every pipeline run adds a new entry)
+MAX_DISK_ENTRIES = 32
+
+def cache_key(body: str, extensions: Tuple[str, ...], style_rev: str) -> str:
+    """Hash of the Markdown source and everything that affects its rendering"""
+    digest = hashlib.sha256(body.encode('utf-8'))
+    digest.update(repr(extensions).encode('utf-8'))
+    digest.update(style_rev.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+def md_to_html_cached(body: str, extensions: Tuple[str, ...], style_rev: str,
+                      cache_dir: Path, render: Optional[Callable[[str], str]] = None) -> str:
+    """
+    Render Markdown to HTML, reusing earlier results for identical input
+
+    Args:
+        body: Markdown source
+        extensions: Markdown extensions used for rendering (part of the key)
+        style_rev: Revision string; bump it to invalidate cached output
+        cache_dir: Directory holding <hash>.html files
+        render: Markdown-to-HTML callable (python-markdown if None)
+
+    Returns:
+        Rendered HTML fragment
+    """
+    key = cache_key(body, extensions, style_rev)
+
+    with _memory_lock:
+        html = _memory_cache.get(key)
+        if html is not None:
+            _memory_cache.move_to_end(key)
+            return html
+
+    cache_file = Path(cache_dir) / f"{key}.html"
+    try:
+        html = cache_file.read_text(encoding='utf-8')
+        logger.debug(f"Markdown cache hit: {cache_file.name}")
+        # Refresh the mtime so pruning drops the least recently used entries
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+    except FileNotFoundError:
+        if render is None:
+            import markdown
+            html = markdown.markdown(body, extensions=list(extensions))
+        else:
+            html = render(body)
+        _write_cache_file(cache_file, html)
+        _prune_cache_dir(cache_file.parent)
+
+    with _memory_lock:
+        _memory_cache[key] = html
+        _memory_cache.move_to_end(key)
+        if len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+    return html
+
+def _write_cache_file(cache_file: Path, html: str):
+    """Write a cache entry atomically; a failed write only costs a re-render"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(html, encoding='utf-8')
+        tmp.replace(cache_file)
+    except OSError as e:
+        logger.warning(f"Could not write Markdown cache {cache_file}: {e}")
+
+def _prune_cache_dir(cache_dir: Path, max_entries: int = MAX_DISK_ENTRIES):
+    """Delete the least recently used cache files beyond max_entries"""
+    try:
+        entries = []
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith('.html') and entry.is_file():
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+    except OSError:
+        return
+
+    if len(entries) <= max_entries:
+        return
+
+    entries.sort()
+    for _, path in entries[:-max_entries]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
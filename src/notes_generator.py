@@ -6,76 +6,102 @@ Generate comprehensive study notes from transcripts
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
 import logging
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 from config_loader import Config
-from resources_db import ResourcesDatabase
+from resources_db import get_alphabet, get_resources
 from pdf_generator import PDFGenerator
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Maximum learning points listed per lesson
+MAX_VOCAB_ITEMS = 15
+MAX_GRAMMAR_ITEMS = 10
+
+# Simple keyword-based extraction
+VOCAB_KEYWORDS = frozenset(['word', 'means', 'called', 'vocabulary', 'słowo', 'oznacza'])
+GRAMMAR_KEYWORDS = frozenset(['grammar', 'rule', 'form', 'gramatyka', 'zasada'])
+
 class NotesGenerator:
     """Generate comprehensive study notes"""
 
     def __init__(self, config: Config):
         self.config = config
-        self.resources_db = ResourcesDatabase()
-        self.pdf_generator = PDFGenerator()
+        self.pdf_generator = PDFGenerator(parser=config.get('notes.markdown_parser', 'markdown'))
+
+        # Header values are fixed for the lifetime of the generator
+        self.lang = config.get('course.language', 'Language')
+        self.level = config.get('course.level', 'A1')
+        self.institution = config.get('course.institution', '')
+        self.generated_at = datetime.now().strftime('%Y-%m-%d %H:%M')
 
     def generate(self, output_path: Path):
         """Generate complete notes file"""
         logger.info("Analyzing transcripts and generating notes...")
 
-        content = []
+        # Save Markdown, writing each section as soon as it is built; a temp file
+        # renamed at the end means a failure never leaves truncated notes behind
+        total = 0
+        tmp = output_path.with_suffix('.tmp')
+        try:
+            with open(tmp, 'wb') as f:
+                for i, section in enumerate(self._iter_sections()):
+                    if i:
+                        f.write(b'\n')
+                    f.write(section.encode('utf-8'))
+                    total += len(section)
+            tmp.replace(output_path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+        logger.info(f"✓ Notes generated: {total} characters")
+
+        # Generate PDF if enabled
+        if self.config.get('notes.generate_pdf', True):
+            logger.info("Generating PDF version...")
+            pdf_path = self.pdf_generator.generate_from_notes(output_path)
+            if pdf_path:
+                logger.info(f"✓ PDF saved: {pdf_path}")
+            else:
+                logger.warning("PDF generation skipped (install: pip install weasyprint)")
 
+    def _iter_sections(self) -> Iterator[str]:
+        """Yield the notes sections in document order"""
         # Header
-        content.append(self._generate_header())
+        yield self._generate_header()
 
         # Alphabet section (if non-Latin script)
         if self.config.get('notes.include_alphabet', True):
-            alphabet = self.resources_db.get_alphabet(self.config.language_code)
+            alphabet = get_alphabet(self.config.language_code)
             if alphabet:
-                content.append(alphabet)
+                yield alphabet
 
         # Lesson sections
-        lessons = self.config.get('sources.0.lessons', [])
+        lessons = self.config.lessons
         for i, lesson in enumerate(lessons, 1):
-            content.append(self._generate_lesson_section(i, lesson))
+            yield self._generate_lesson_section(i, lesson)
 
         # Resources section
         if self.config.get('notes.include_resources', True):
-            content.append(self._generate_resources_section())
+            yield self._generate_resources_section()
 
         # Footer
-        content.append(self._generate_footer())
-
-        # Save Markdown
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content))
-
-        logger.info(f"✓ Notes generated: {len(''.join(content))} characters")
-
-        # Generate PDF if enabled
-        if self.config.get('notes.generate_pdf', True):
-            logger.info("Generating PDF version...")
-            pdf_path = self.pdf_generator.generate_from_notes(output_path)
-            if pdf_path:
-                logger.info(f"✓ PDF saved: {pdf_path}")
-            else:
-                logger.warning("PDF generation skipped (install: pip install weasyprint)")
+        yield self._generate_footer()
 
     def _generate_header(self) -> str:
         """Generate notes header"""
-        lang = self.config.get('course.language', 'Language')
-        level = self.config.get('course.level', 'A1')
-        institution = self.config.get('course.institution', '')
-
-        return f"""# 📚 Comprehensive {lang} Study Notes - {level}
-**{institution if institution else 'Language Course'}**
+        return f"""# 📚 Comprehensive {self.lang} Study Notes - {self.level}
+**{self.institution if self.institution else 'Language Course'}**
 
-*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*
+*Generated: {self.generated_at}*
 
 ---
 
@@ -115,57 +141,64 @@ These comprehensive notes include:
         filename = lesson.get('filename', '')
 
         # Load transcript JSON if exists
-        json_path = self.config.transcripts_dir / filename.replace('.mp4', '.json')
+        json_path = self.config.transcripts_dir / f"{Path(filename).stem}.json"
 
-        section = f"""
+        parts = [f"""
 <a name="lesson-{lesson_num}"></a>
 ## 📅 Lesson {lesson_num} - {date}
 ### {title}
 
-"""
+"""]
 
         if json_path.exists():
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
             # Analyze transcript
-            analysis = self._analyze_transcript(data)
+            analysis = self._analyze_transcript(self._iter_segments(json_path))
 
             # Add sections
             if analysis.get('vocabulary'):
-                section += "#### 📚 Vocabulary\n\n"
-                for item in analysis['vocabulary'][:15]:
-                    section += f"- **[{item['time']}]** {item['text'][:100]}...\n"
-                section += "\n"
+                parts.append("#### 📚 Vocabulary\n\n")
+                for item in analysis['vocabulary']:
+                    parts.append(f"- **[{item['time']}]** {item['text'][:100]}...\n")
+                parts.append("\n")
 
             if analysis.get('grammar'):
-                section += "#### 📖 Grammar\n\n"
-                for item in analysis['grammar'][:10]:
-                    section += f"**[{item['time']}]**\n> {item['text'][:150]}...\n\n"
+                parts.append("#### 📖 Grammar\n\n")
+                for item in analysis['grammar']:
+                    parts.append(f"**[{item['time']}]**\n> {item['text'][:150]}...\n\n")
 
-        section += f"\n📹 **Video:** {filename}\n\n---\n"
+        parts.append(f"\n📹 **Video:** {filename}\n\n---\n")
 
-        return section
+        return ''.join(parts)
 
-    def _analyze_transcript(self, data: Dict) -> Dict:
-        """Analyze transcript to extract learning points"""
-        segments = data.get('segments', [])
-
-        # Simple keyword-based extraction
-        vocab_keywords = ['word', 'means', 'called', 'vocabulary', 'słowo', 'oznacza']
-        grammar_keywords = ['grammar', 'rule', 'form', 'gramatyka', 'zasada']
+    @staticmethod
+    def _iter_segments(json_path: Path) -> Iterator[Dict]:
+        """Yield transcript segments, streaming the JSON when ijson is installed"""
+        if ijson is not None:
+            with open(json_path, 'rb') as f:
+                yield from ijson.items(f, 'segments.item', use_float=True)
+        else:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            yield from data.get('segments', [])
 
+    def _analyze_transcript(self, segments: Iterable[Dict]) -> Dict:
+        """Analyze transcript to extract learning points"""
         vocab = []
         grammar = []
 
         for seg in segments:
+            # Substring search on one lowercased copy beats a fused regex here
             text = seg['text'].lower()
-            timestamp = self._format_timestamp(seg['start'])
 
-            if any(kw in text for kw in vocab_keywords):
-                vocab.append({'time': timestamp, 'text': seg['text'].strip()})
-            elif any(kw in text for kw in grammar_keywords):
-                grammar.append({'time': timestamp, 'text': seg['text'].strip()})
+            if any(kw in text for kw in VOCAB_KEYWORDS):
+                if len(vocab) < MAX_VOCAB_ITEMS:
+                    vocab.append({'time': self._format_timestamp(seg['start']), 'text': seg['text'].strip()})
+            elif any(kw in text for kw in GRAMMAR_KEYWORDS):
+                if len(grammar) < MAX_GRAMMAR_ITEMS:
+                    grammar.append({'time': self._format_timestamp(seg['start']), 'text': seg['text'].strip()})
+
+            if len(vocab) >= MAX_VOCAB_ITEMS and len(grammar) >= MAX_GRAMMAR_ITEMS:
+                break
 
         return {'vocabulary': vocab, 'grammar': grammar}
 
@@ -174,7 +207,7 @@ These comprehensive notes include:
         lang_code = self.config.language_code
         native_lang = self.config.native_language
 
-        resources = self.resources_db.get_resources(lang_code, native_lang)
+        resources = get_resources(lang_code, native_lang)
 
         if not resources:
             return "\n## 🌟 External Resources\n\n*Resources not yet available for this language.*\n"
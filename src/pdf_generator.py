@@ -3,19 +3,169 @@
 Generate tablet-friendly PDF files from Markdown notes
 """
 
+import html
 import markdown
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional
 import logging
 
+from md_cache import md_to_html_cached
+
 logger = logging.getLogger(__name__)
 
+# Markdown extensions used for rendering
+EXT_TUPLE = (
+    'extra',          # Tables, fenced code, etc.
+    'codehilite',     # Syntax highlighting
+    'toc',            # Table of contents
+    'sane_lists',     # Better list handling
+    'nl2br',          # Newline to <br>
+)
+
+# markdown-it-py setup (opt-in parser, see PARSERS); also the cache key for its output
+MDIT_FEATURES = ('markdown-it', 'commonmark', 'html', 'table', 'breaks', 'anchors', 'pygments',
+                 'footnote', 'deflist', 'attrs', 'toc-marker')
+
+# Markdown parsers: python-markdown is the default; markdown-it-py is faster but has no abbr support
+PARSERS = ('markdown', 'markdown-it')
+
+# Bump to invalidate cached HTML when Markdown rendering changes
+STYLE_REV = "1"
+
+# Rendered HTML is cached next to the Markdown file
+MD_CACHE_DIRNAME = ".md-html-cache"
+
+# HTML document wrapped around each rendered body (styles are passed to WeasyPrint separately)
+_DOC_PREFIX = ('<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">'
+               '<meta name="viewport" content="width=device-width, initial-scale=1.0">'
+               '<title>Language Learning Notes</title></head><body>')
+_DOC_SUFFIX = '</body></html>'
+
+def _highlight_code(code: str, lang: str, attrs: str) -> str:
+    """Pygments highlighting for fenced code blocks (empty string keeps default escaping)"""
+    if not lang:
+        return ''
+    try:
+        from pygments import highlight
+        from pygments.formatters import HtmlFormatter
+        from pygments.lexers import get_lexer_by_name
+        from pygments.util import ClassNotFound
+    except ImportError:
+        return ''
+    try:
+        lexer = get_lexer_by_name(lang)
+    except ClassNotFound:
+        return ''
+    return highlight(code, lexer, HtmlFormatter(nowrap=True))
+
+def _toc_html(headings: List[tuple]) -> str:
+    """Nested list of (level, id, text) headings, shaped like python-markdown's toc output"""
+    parts = ['<div class="toc">']
+    # Heading level of each open <ul>; every open <ul> has an open <li> at its end
+    stack = []
+    for level, anchor, text in headings:
+        if not stack or level > stack[-1]:
+            parts.append('<ul>')
+            stack.append(level)
+        else:
+            parts.append('</li>')
+            while len(stack) > 1 and level < stack[-1]:
+                if level > stack[-2]:
+                    # Between two open levels (e.g. h1 > h3 then h2): sibling in the deeper list
+                    stack[-1] = level
+                    break
+                parts.append('</ul></li>')
+                stack.pop()
+        parts.append(f'<li><a href="#{html.escape(anchor or "")}">{html.escape(text)}</a>')
+    if stack:
+        parts.append('</li>' + '</ul></li>' * (len(stack) - 1) + '</ul>')
+    parts.append('</div>\n')
+    return ''.join(parts)
+
+def _toc_rule(state):
+    """Replace paragraphs holding only [TOC] with a table of contents (needs heading ids from anchors_plugin)"""
+    from markdown_it.token import Token
+
+    tokens = state.tokens
+    markers = [
+        i for i, tok in enumerate(tokens)
+        if tok.type == 'inline' and tok.content.strip() == '[TOC]'
+        and tokens[i - 1].type == 'paragraph_open'
+    ]
+    if not markers:
+        return
+
+    headings = [
+        (int(tok.tag[1]), tok.attrGet('id'),
+         ''.join(child.content for child in tokens[i + 1].children or ()
+                 if child.type in ('text', 'code_inline')))
+        for i, tok in enumerate(tokens) if tok.type == 'heading_open'
+    ]
+    toc = Token('html_block', '', 0, content=_toc_html(headings))
+
+    for i in reversed(markers):
+        tokens[i - 1:i + 2] = [toc]
+
+def _build_markdown_it():
+    """Build a markdown-it-py parser close to the python-markdown extensions (no abbr), or None if not installed"""
+    try:
+        from markdown_it import MarkdownIt
+        from mdit_py_plugins.anchors import anchors_plugin
+        from mdit_py_plugins.attrs import attrs_block_plugin, attrs_plugin
+        from mdit_py_plugins.deflist import deflist_plugin
+        from mdit_py_plugins.footnote import footnote_plugin
+    except ImportError:
+        return None
+
+    md = (
+        MarkdownIt('commonmark', {'html': True, 'breaks': True, 'highlight': _highlight_code})
+        .enable('table')
+        .use(anchors_plugin, max_level=6)
+        .use(footnote_plugin)
+        .use(deflist_plugin)
+        .use(attrs_plugin)
+        .use(attrs_block_plugin)
+    )
+    md.core.ruler.push('toc', _toc_rule)
+    return md
+
+# Quoted strings are kept verbatim; comments and whitespace around punctuation are dropped
+_CSS_TOKEN_RE = re.compile(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')|(/\*.*?\*/)|(\s+)', re.DOTALL)
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet"""
+    def _sub(m):
+        if m.group(1):
+            return m.group(1)
+        return '' if m.group(2) else ' '
+
+    css = _CSS_TOKEN_RE.sub(_sub, css)
+    # Spaces next to punctuation carry no meaning (but keep them inside strings)
+    parts = re.split(r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\')', css)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\s*([{}:;,>])\s*', r'\1', parts[i]).replace(';}', '}')
+    return ''.join(parts).strip()
+
+# Smaller, faster PDFs for tablets: recompressed images, subset fonts (WeasyPrint >= 59)
+PDF_OPTIONS = {
+    'optimize_images': True,
+    'jpeg_quality': 80,
+    'dpi': 150,
+    'full_fonts': False,
+    'hinting': False,
+    'uncompressed_pdf': False,
+}
+
 class PDFGenerator:
     """Generate tablet-friendly PDFs from Markdown"""
 
-    # Tablet-friendly CSS styling
+    # Tablet-friendly CSS styling (compiled once per generator, see `stylesheet`)
     PDF_STYLES = """
-    <style>
         @page {
             size: A4;
             margin: 2cm 1.5cm;
@@ -33,14 +183,14 @@ class PDFGenerator:
 
         body {
             font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-            font-size: 11pt;
+            font-size: 10pt;
             line-height: 1.6;
             color: #333;
             max-width: 100%;
         }
 
         h1 {
-            font-size: 24pt;
+            font-size: 20pt;
             font-weight: bold;
             color: #1a1a1a;
             margin-top: 1.5em;
@@ -51,7 +201,7 @@ class PDFGenerator:
         }
 
         h2 {
-            font-size: 18pt;
+            font-size: 16pt;
             font-weight: bold;
             color: #2c3e50;
             margin-top: 1.3em;
@@ -60,7 +210,7 @@ class PDFGenerator:
         }
 
         h3 {
-            font-size: 14pt;
+            font-size: 13pt;
             font-weight: bold;
             color: #34495e;
             margin-top: 1em;
@@ -161,10 +311,6 @@ class PDFGenerator:
             text-decoration: none;
         }
 
-        a:hover {
-            text-decoration: underline;
-        }
-
         /* Horizontal rules */
         hr {
             border: none;
@@ -193,11 +339,6 @@ class PDFGenerator:
             padding-left: 0;
         }
 
-        nav a {
-            color: #4A90E2;
-            text-decoration: none;
-        }
-
         /* Page breaks */
         .page-break {
             page-break-before: always;
@@ -213,27 +354,31 @@ class PDFGenerator:
             direction: rtl;
             text-align: right;
         }
-
-        /* Print-friendly adjustments */
-        @media print {
-            body {
-                font-size: 10pt;
-            }
-            h1 { font-size: 20pt; }
-            h2 { font-size: 16pt; }
-            h3 { font-size: 13pt; }
-        }
-    </style>
     """
 
-    def __init__(self, tablet_mode: str = "standard"):
+    def __init__(self, tablet_mode: str = "standard", parser: str = "markdown"):
         """
         Initialize PDF generator
 
         Args:
             tablet_mode: "standard" (A4), "tablet" (smaller margins), or "ebook" (compact)
+            parser: "markdown" (python-markdown) or "markdown-it" (faster, needs markdown-it-py)
         """
         self.tablet_mode = tablet_mode
+        self.parser = parser
+
+        # markdown-it-py parser (stateless per render) when requested; python-markdown otherwise
+        self._mdit = _build_markdown_it() if parser == "markdown-it" else None
+        if parser == "markdown-it" and self._mdit is None:
+            logger.warning("markdown-it-py not installed, using python-markdown "
+                           "(pip install markdown-it-py mdit-py-plugins)")
+
+        # One reusable python-markdown converter per thread (instances are not thread-safe)
+        self._md_local = threading.local()
+
+        # Parsed stylesheet and image cache shared by every PDF from this generator
+        self._css = None
+        self._image_cache = {}
 
         # Set up library path for macOS (for WeasyPrint dependencies)
         self._setup_library_path()
@@ -241,9 +386,11 @@ class PDFGenerator:
         # Check if weasyprint is available
         try:
             from weasyprint import HTML, CSS
+            from weasyprint.text.fonts import FontConfiguration
             self.weasyprint_available = True
             self.HTML = HTML
             self.CSS = CSS
+            self.font_config = FontConfiguration()
         except ImportError:
             logger.warning("weasyprint not installed. PDF generation will be unavailable.")
             logger.info("Install with: pip install weasyprint && brew install pango gdk-pixbuf glib")
@@ -257,6 +404,13 @@ class PDFGenerator:
                 logger.warning(f"WeasyPrint initialization error: {e}")
             self.weasyprint_available = False
 
+    @property
+    def stylesheet(self):
+        """PDF_STYLES minified and parsed once into a weasyprint CSS object"""
+        if self._css is None:
+            self._css = self.CSS(string=minify_css(self.PDF_STYLES), font_config=self.font_config)
+        return self._css
+
     def _setup_library_path(self):
         """Set up library path for macOS"""
         import os
@@ -269,6 +423,16 @@ class PDFGenerator:
                 if homebrew_lib not in current_path:
                     os.environ["DYLD_LIBRARY_PATH"] = f"{homebrew_lib}:{current_path}"
 
+    def _render_markdown(self, md_content: str) -> str:
+        """Convert Markdown to HTML with markdown-it-py, or this thread's python-markdown converter"""
+        if self._mdit is not None:
+            return self._mdit.render(md_content)
+
+        md = getattr(self._md_local, 'md', None)
+        if md is None:
+            md = self._md_local.md = markdown.Markdown(extensions=list(EXT_TUPLE))
+        return md.reset().convert(md_content)
+
     def markdown_to_html(self, markdown_path: Path) -> str:
         """
         Convert Markdown file to HTML with styling
@@ -277,40 +441,21 @@ class PDFGenerator:
             markdown_path: Path to Markdown file
 
         Returns:
-            HTML string with embedded CSS
+            HTML string (styles are applied separately, see `stylesheet`)
         """
         # Read Markdown content
         with open(markdown_path, 'r', encoding='utf-8') as f:
             md_content = f.read()
 
-        # Convert Markdown to HTML with extensions
-        html_content = markdown.markdown(
-            md_content,
-            extensions=[
-                'extra',          # Tables, fenced code, etc.
-                'codehilite',     # Syntax highlighting
-                'toc',            # Table of contents
-                'sane_lists',     # Better list handling
-                'nl2br',          # Newline to <br>
-            ]
+        # Convert Markdown to HTML with extensions (cached by content hash)
+        html_content = md_to_html_cached(
+            md_content, MDIT_FEATURES if self._mdit is not None else EXT_TUPLE, STYLE_REV,
+            Path(markdown_path).parent / MD_CACHE_DIRNAME,
+            render=self._render_markdown
         )
 
-        # Wrap in full HTML document with styling
-        full_html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Language Learning Notes</title>
-    {self.PDF_STYLES}
-</head>
-<body>
-    {html_content}
-</body>
-</html>
-"""
-        return full_html
+        # Wrap in full HTML document
+        return _DOC_PREFIX + html_content + _DOC_SUFFIX
 
     def generate_pdf(self, markdown_path: Path, pdf_path: Optional[Path] = None) -> Optional[Path]:
         """
@@ -330,7 +475,8 @@ class PDFGenerator:
 
         # Auto-generate PDF path if not provided
         if pdf_path is None:
-            pdf_path = markdown_path.with_suffix('.pdf')
+            pdf_path = markdown_path.parent / (markdown_path.stem + '.pdf')
+        pdf_str = os.fspath(pdf_path)
 
         try:
             logger.info(f"Converting {markdown_path.name} to PDF...")
@@ -339,13 +485,16 @@ class PDFGenerator:
             html_content = self.markdown_to_html(markdown_path)
 
             # Generate PDF from HTML
-            from weasyprint import HTML
-            html_doc = HTML(string=html_content)
-            html_doc.write_pdf(str(pdf_path))
+            html_doc = self.HTML(string=html_content)
+            html_doc.write_pdf(
+                pdf_str,
+                stylesheets=[self.stylesheet],
+                font_config=self.font_config,
+                cache=self._image_cache,
+                **PDF_OPTIONS
+            )
 
-            # Get file size for logging
-            size_mb = pdf_path.stat().st_size / (1024 * 1024)
-            logger.info(f"✓ PDF generated: {pdf_path.name} ({size_mb:.2f} MB)")
+            logger.info(f"✓ PDF generated: {os.path.basename(pdf_str)} ({self._finish_pdf(pdf_str)})")
 
             return pdf_path
 
@@ -353,6 +502,107 @@ class PDFGenerator:
             logger.error(f"PDF generation failed: {e}")
             return None
 
+    def _finish_pdf(self, pdf_path: str) -> str:
+        """Linearize the PDF for fast web view if pikepdf is installed; return a size summary"""
+        size_mb = os.path.getsize(pdf_path) / 1048576
+
+        try:
+            import pikepdf
+        except ImportError:
+            return f"{size_mb:.2f} MB"
+
+        try:
+            with pikepdf.open(pdf_path, allow_overwriting_input=True) as pdf:
+                pdf.save(pdf_path, linearize=True)
+        except Exception as e:
+            logger.warning(f"PDF linearization skipped: {e}")
+            return f"{size_mb:.2f} MB"
+
+        linearized_mb = os.path.getsize(pdf_path) / 1048576
+        return f"{size_mb:.2f} MB, {linearized_mb:.2f} MB linearized"
+
+    def generate_many(self, markdown_paths: List[Path], out_pdf: Path) -> Optional[Path]:
+        """
+        Render several Markdown files into one combined PDF
+
+        The stylesheet, font configuration and image cache are shared by all
+        documents, and the PDF is written once at the end.
+
+        Args:
+            markdown_paths: Markdown files, in page order
+            out_pdf: Output PDF path
+
+        Returns:
+            Path to generated PDF file, or None if failed
+        """
+        if not self.weasyprint_available:
+            logger.error("Cannot generate PDF: weasyprint not installed")
+            logger.info("Install with: pip install weasyprint")
+            return None
+
+        if not markdown_paths:
+            logger.error("No Markdown files to combine")
+            return None
+
+        try:
+            logger.info(f"Combining {len(markdown_paths)} Markdown files into {out_pdf.name}...")
+
+            documents = []
+            all_pages = []
+            for markdown_path in markdown_paths:
+                html_content = self.markdown_to_html(markdown_path)
+                doc = self.HTML(string=html_content).render(
+                    stylesheets=[self.stylesheet],
+                    font_config=self.font_config,
+                    cache=self._image_cache,
+                    **PDF_OPTIONS
+                )
+                documents.append(doc)
+                all_pages.extend(doc.pages)
+
+            out_str = os.fspath(out_pdf)
+            documents[0].copy(all_pages).write_pdf(out_str, **PDF_OPTIONS)
+
+            logger.info(f"✓ PDF generated: {out_pdf.name} ({len(all_pages)} pages, {self._finish_pdf(out_str)})")
+
+            return out_pdf
+
+        except Exception as e:
+            logger.error(f"PDF generation failed: {e}")
+            return None
+
+    def generate_batch(self, paths: List[Path], out_dir: Optional[Path] = None,
+                       workers: Optional[int] = None) -> Iterator[Optional[Path]]:
+        """
+        Convert many Markdown files to separate PDFs in parallel processes
+
+        Args:
+            paths: Markdown files to convert
+            out_dir: Optional output directory (next to each file if None)
+            workers: Number of worker processes (CPU count if None)
+
+        Yields:
+            PDF path (or None if failed) for each input, in input order, as soon as it is ready
+        """
+        if not self.weasyprint_available:
+            logger.error("Cannot generate PDF: weasyprint not installed")
+            logger.info("Install with: pip install weasyprint")
+            yield from [None] * len(paths)
+            return
+
+        if not paths:
+            return
+
+        pdf_paths = [
+            Path(out_dir) / (Path(path).stem + '.pdf') if out_dir else None
+            for path in paths
+        ]
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            convert = partial(generate_pdf_from_markdown, parser=self.parser)
+            yield from executor.map(convert, paths, pdf_paths)
+
     def generate_from_notes(self, notes_path: Path, output_dir: Optional[Path] = None) -> Optional[Path]:
         """
         Generate PDF from comprehensive notes
@@ -364,24 +614,28 @@ class PDFGenerator:
         Returns:
             Path to generated PDF, or None if failed
         """
-        if output_dir:
-            pdf_path = output_dir / notes_path.with_suffix('.pdf').name
-        else:
-            pdf_path = notes_path.with_suffix('.pdf')
+        pdf_path = (output_dir or notes_path.parent) / (notes_path.stem + '.pdf')
 
         return self.generate_pdf(notes_path, pdf_path)
 
 
-def generate_pdf_from_markdown(markdown_path: Path, pdf_path: Optional[Path] = None) -> Optional[Path]:
+# Shared generator for the convenience function (one per process, e.g. batch workers)
+_default_generator = None
+
+def generate_pdf_from_markdown(markdown_path: Path, pdf_path: Optional[Path] = None,
+                               parser: str = "markdown") -> Optional[Path]:
     """
     Convenience function to generate PDF from Markdown
 
     Args:
         markdown_path: Path to Markdown file
         pdf_path: Optional output PDF path
+        parser: Markdown parser, see PDFGenerator
 
     Returns:
         Path to generated PDF, or None if failed
     """
-    generator = PDFGenerator()
-    return generator.generate_pdf(markdown_path, pdf_path)
+    global _default_generator
+    if _default_generator is None or _default_generator.parser != parser:
+        _default_generator = PDFGenerator(parser=parser)
+    return _default_generator.generate_pdf(markdown_path, pdf_path)
@@ -1,17 +1,31 @@
 #!/usr/bin/env python3
 """Progress tracking for resumable processing"""
 
+import atexit
 import json
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Set
 
+# mark_completed() writes at most every SAVE_INTERVAL seconds or SAVE_EVERY tasks;
+# anything pending is written by flush(), at the end of batched() or at exit
+SAVE_INTERVAL = 2.0
+SAVE_EVERY = 16
+
 class ProgressTracker:
     """Track processing progress for resumability"""
 
     def __init__(self, progress_file: Path):
         self.progress_file = Path(progress_file)
         self.data = self._load()
+        # Mirrors data['completed'] (which keeps insertion order for the JSON)
+        self._completed_set = set(self.data['completed'])
+        self._batch_depth = 0
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
 
     def _load(self) -> dict:
         """Load progress from JSON file"""
@@ -27,18 +41,43 @@ class ProgressTracker:
     def _save(self):
         """Save progress to JSON file"""
         self.data['last_updated'] = datetime.now().isoformat()
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+        # Write to a temp file and rename so an interrupted save never truncates progress
+        tmp = self.progress_file.with_suffix('.tmp')
+        tmp.write_text(json.dumps(self.data, separators=(',', ':')))
+        tmp.replace(self.progress_file)
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Write pending progress to disk"""
+        if self._dirty:
+            self._save()
+
+    @contextmanager
+    def batched(self):
+        """Defer saving until the block exits (including on error)"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
 
     def mark_completed(self, task_id: str):
         """Mark a task as completed"""
-        if task_id not in self.data['completed']:
+        if task_id not in self._completed_set:
+            self._completed_set.add(task_id)
             self.data['completed'].append(task_id)
-            self._save()
+            self._dirty = True
+            if not self._batch_depth and (
+                    time.monotonic() - self._last_flush >= SAVE_INTERVAL
+                    or len(self.data['completed']) % SAVE_EVERY == 0):
+                self._save()
 
     def is_completed(self, task_id: str) -> bool:
         """Check if a task is completed"""
-        return task_id in self.data['completed']
+        return task_id in self._completed_set
 
     def reset(self):
         """Reset all progress"""
@@ -47,4 +86,5 @@ class ProgressTracker:
             'started': datetime.now().isoformat(),
             'last_updated': datetime.now().isoformat()
         }
+        self._completed_set = set()
         self._save()
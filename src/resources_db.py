@@ -3,27 +3,11 @@
 Resources database for different languages
 """
 
-from typing import Dict, Optional
+from typing import ClassVar, Dict, Optional
 
-class ResourcesDatabase:
-    """Database of language learning resources"""
-
-    def __init__(self):
-        self.alphabets = self._init_alphabets()
-        self.resources = self._init_resources()
-
-    def get_alphabet(self, language_code: str) -> Optional[str]:
-        """Get alphabet section for a language"""
-        return self.alphabets.get(language_code)
-
-    def get_resources(self, language_code: str, native_lang: str = "en") -> Optional[str]:
-        """Get resources for a language"""
-        return self.resources.get(language_code, self.resources.get('_template'))
-
-    def _init_alphabets(self) -> Dict[str, str]:
-        """Initialize alphabet sections for non-Latin scripts"""
-        return {
-            'ar': """<a name="alphabet"></a>
+# Alphabet sections for non-Latin scripts
+_ALPHABETS: Dict[str, str] = {
+    'ar': """<a name="alphabet"></a>
 ## 🔤 Arabic Alphabet (‫)األبجدية العربية‬
 
 28 letters, written right-to-left, with different forms per position.
@@ -46,7 +30,7 @@ class ResourcesDatabase:
 - YouTube: "Learn Arabic Alphabet" by ArabicPod101
 
 ---""",
-            'ja': """<a name="alphabet"></a>
+    'ja': """<a name="alphabet"></a>
 ## 🔤 Japanese Writing Systems
 
 Japanese uses 3 scripts: Hiragana, Katakana, and Kanji.
@@ -66,7 +50,7 @@ Chinese characters
 - Tofugu's Hiragana/Katakana guides
 
 ---""",
-            'zh': """<a name="alphabet"></a>
+    'zh': """<a name="alphabet"></a>
 ## 🔤 Chinese Characters (汉字)
 
 Mandarin Chinese uses logographic characters.
@@ -83,7 +67,7 @@ Mandarin Chinese uses logographic characters.
 - Fourth tone: à (falling)
 
 ---""",
-            'ru': """<a name="alphabet"></a>
+    'ru': """<a name="alphabet"></a>
 ## 🔤 Russian Alphabet (Кириллица)
 
 33 letters in Cyrillic script.
@@ -98,23 +82,9 @@ Mandarin Chinese uses logographic characters.
 [Full alphabet chart in materials]
 
 ---""",
-        }
-
-    def _init_resources(self) -> Dict[str, str]:
-        """Initialize resources for different languages"""
-        return {
-            'ar': self._get_arabic_resources(),
-            'ja': self._get_japanese_resources(),
-            'zh': self._get_chinese_resources(),
-            'es': self._get_spanish_resources(),
-            'fr': self._get_french_resources(),
-            'de': self._get_german_resources(),
-            'ru': self._get_russian_resources(),
-            '_template': self._get_template_resources()
-        }
-
-    def _get_arabic_resources(self) -> str:
-        return """<a name="resources"></a>
+}
+
+_AR_RES = """<a name="resources"></a>
 ## 🌟 Arabic Learning Resources
 
 ### 📱 Mobile Apps
@@ -147,38 +117,7 @@ Mandarin Chinese uses logographic characters.
 
 ---"""
 
-    def _get_template_resources(self) -> str:
-        """Generic template for any language"""
-        return """<a name="resources"></a>
-## 🌟 Language Learning Resources
-
-### 📱 Recommended Apps
-- **Duolingo** - Free gamified learning
-- **Memrise** - Vocabulary with mnemonics
-- **Busuu** - Structured courses
-- **Anki** - Spaced repetition flashcards
-
-### 🎥 YouTube
-- Search: "[Language] for beginners"
-- Easy Languages channel
-- Language-specific channels
-
-### 🌐 Websites
-- iTalki - Find tutors
-- Tandem - Language exchange
-- LingQ - Reading + listening
-
-### 📚 Study Tips
-1. Practice daily (15-30 min minimum)
-2. Use spaced repetition
-3. Immerse yourself (music, movies, podcasts)
-4. Speak from day 1 (language exchange)
-5. Join online communities
-
----"""
-
-    def _get_japanese_resources(self) -> str:
-        return """<a name="resources"></a>
+_JA_RES = """<a name="resources"></a>
 ## 🌟 Japanese Learning Resources
 
 ### 📱 Apps
@@ -199,8 +138,7 @@ Mandarin Chinese uses logographic characters.
 
 ---"""
 
-    def _get_spanish_resources(self) -> str:
-        return """<a name="resources"></a>
+_ES_RES = """<a name="resources"></a>
 ## 🌟 Spanish Learning Resources
 
 ### 📱 Apps
@@ -220,8 +158,7 @@ Mandarin Chinese uses logographic characters.
 
 ---"""
 
-    def _get_french_resources(self) -> str:
-        return """<a name="resources"></a>
+_FR_RES = """<a name="resources"></a>
 ## 🌟 French Learning Resources
 
 ### 📱 Apps
@@ -236,8 +173,7 @@ Mandarin Chinese uses logographic characters.
 
 ---"""
 
-    def _get_german_resources(self) -> str:
-        return """<a name="resources"></a>
+_DE_RES = """<a name="resources"></a>
 ## 🌟 German Learning Resources
 
 ### 📱 Apps
@@ -252,8 +188,7 @@ Mandarin Chinese uses logographic characters.
 
 ---"""
 
-    def _get_russian_resources(self) -> str:
-        return """<a name="resources"></a>
+_RU_RES = """<a name="resources"></a>
 ## 🌟 Russian Learning Resources
 
 ### 📱 Apps
@@ -268,8 +203,7 @@ Mandarin Chinese uses logographic characters.
 
 ---"""
 
-    def _get_chinese_resources(self) -> str:
-        return """<a name="resources"></a>
+_ZH_RES = """<a name="resources"></a>
 ## 🌟 Chinese Learning Resources
 
 ### 📱 Apps
@@ -283,3 +217,67 @@ Mandarin Chinese uses logographic characters.
 - Mandarin Corner
 
 ---"""
+
+# Generic template for any language
+_TEMPLATE_RES = """<a name="resources"></a>
+## 🌟 Language Learning Resources
+
+### 📱 Recommended Apps
+- **Duolingo** - Free gamified learning
+- **Memrise** - Vocabulary with mnemonics
+- **Busuu** - Structured courses
+- **Anki** - Spaced repetition flashcards
+
+### 🎥 YouTube
+- Search: "[Language] for beginners"
+- Easy Languages channel
+- Language-specific channels
+
+### 🌐 Websites
+- iTalki - Find tutors
+- Tandem - Language exchange
+- LingQ - Reading + listening
+
+### 📚 Study Tips
+1. Practice daily (15-30 min minimum)
+2. Use spaced repetition
+3. Immerse yourself (music, movies, podcasts)
+4. Speak from day 1 (language exchange)
+5. Join online communities
+
+---"""
+
+# Learning resources per language ('_template' is the generic fallback)
+_RESOURCES: Dict[str, str] = {
+    'ar': _AR_RES,
+    'ja': _JA_RES,
+    'zh': _ZH_RES,
+    'es': _ES_RES,
+    'fr': _FR_RES,
+    'de': _DE_RES,
+    'ru': _RU_RES,
+    '_template': _TEMPLATE_RES
+}
+
+def get_alphabet(language_code: str) -> Optional[str]:
+    """Get alphabet section for a language"""
+    return _ALPHABETS.get(language_code)
+
+def get_resources(language_code: str, native_lang: str = "en") -> Optional[str]:
+    """Get resources for a language"""
+    return _RESOURCES.get(language_code, _RESOURCES['_template'])
+
+class ResourcesDatabase:
+    """Database of language learning resources (kept for compatibility; see get_alphabet/get_resources)"""
+
+    # Built once at import and shared by every instance
+    alphabets: ClassVar[Dict[str, str]] = _ALPHABETS
+    resources: ClassVar[Dict[str, str]] = _RESOURCES
+
+    def get_alphabet(self, language_code: str) -> Optional[str]:
+        """Get alphabet section for a language"""
+        return get_alphabet(language_code)
+
+    def get_resources(self, language_code: str, native_lang: str = "en") -> Optional[str]:
+        """Get resources for a language"""
+        return get_resources(language_code, native_lang)
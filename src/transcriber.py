@@ -5,28 +5,78 @@ Audio transcription using Whisper or other engines
 
 import subprocess
 import json
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 import logging
-import whisper
+
+# Backends are optional individually; faster-whisper is preferred when installed
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+try:
+    import whisper
+except ImportError:
+    whisper = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Whisper models expect 16 kHz mono input
+SAMPLE_RATE = 16000
+
+# Silence skipping for openai-whisper (faster-whisper has its own VAD filter)
+VAD_AGGRESSIVENESS = 2
+VAD_FRAME_MS = 30
+VAD_PADDING_MS = 300
+
 class Transcriber:
     """Transcribe audio/video files"""
 
     def __init__(self, model: str = "medium", language: str = None):
+        # Fail before any lesson is processed (and marked done) rather than on first transcription
+        if WhisperModel is None and whisper is None:
+            raise ImportError("No Whisper backend installed (pip install faster-whisper or openai-whisper)")
+
         self.model_name = model
         self.language = language
         self.model = None
+        self.backend = None
 
     def load_model(self):
-        """Load Whisper model (lazy loading)"""
-        if self.model is None:
+        """Load Whisper model (lazy loading), preferring faster-whisper"""
+        if self.model is not None:
+            return
+
+        if WhisperModel is not None:
+            import ctranslate2
+            on_gpu = ctranslate2.get_cuda_device_count() > 0
+            device = "cuda" if on_gpu else "cpu"
+            compute_type = "int8_float16" if on_gpu else "int8"
+
+            logger.info(f"Loading faster-whisper '{self.model_name}' model ({device}, {compute_type})...")
+            self.model = WhisperModel(self.model_name, device=device, compute_type=compute_type)
+            self.backend = "faster-whisper"
+        elif whisper is not None:
             logger.info(f"Loading Whisper '{self.model_name}' model...")
             self.model = whisper.load_model(self.model_name)
-            logger.info("✓ Model loaded")
+            self.backend = "whisper"
+        else:
+            raise ImportError("No Whisper backend installed (pip install faster-whisper or openai-whisper)")
+
+        logger.info("✓ Model loaded")
 
     def extract_audio(self, video_path: Path, audio_path: Path) -> bool:
         """Extract audio from video using ffmpeg"""
@@ -54,58 +104,214 @@ class Transcriber:
             logger.error(f"Error extracting audio: {e}")
             return False
 
+    def load_pcm(self, media_path: Path):
+        """Decode audio straight to Whisper's input format (16 kHz mono float32) via an ffmpeg pipe"""
+        try:
+            import numpy as np
+
+            logger.info(f"Decoding audio from {media_path.name}...")
+
+            cmd = [
+                "ffmpeg", "-nostdin", "-loglevel", "error",
+                "-i", str(media_path),
+                "-vn",  # No video
+                "-f", "s16le", "-acodec", "pcm_s16le",
+                "-ac", "1", "-ar", str(SAMPLE_RATE),
+                "-"
+            ]
+
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+            if result.returncode != 0:
+                logger.error(f"Audio decoding failed: {result.stderr.decode('utf-8', errors='replace')}")
+                return None
+
+            return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+        except Exception as e:
+            logger.error(f"Error decoding audio: {e}")
+            return None
+
     def transcribe(self, audio_path: Path, output_path: Path,
-                   json_path: Optional[Path] = None) -> Dict:
-        """Transcribe audio file"""
+                   json_path: Optional[Path] = None, audio=None) -> Dict:
+        """Transcribe audio file, or pre-decoded samples from load_pcm() if given"""
         try:
             self.load_model()
 
             logger.info(f"Transcribing {audio_path.name}...")
             logger.info("This may take 10-20 minutes for a 1.5-hour audio file...")
 
-            result = self.model.transcribe(
-                str(audio_path),
-                language=self.language,
-                verbose=True,
-                word_timestamps=False
-            )
+            if self.backend == "whisper" and webrtcvad is not None and audio is None:
+                audio = self.load_pcm(audio_path)
+
+            source = str(audio_path) if audio is None else audio
+            if self.backend == "faster-whisper":
+                result = self._transcribe_faster(source)
+            elif webrtcvad is not None and audio is not None:
+                result = self._transcribe_speech(audio)
+            else:
+                result = self.model.transcribe(
+                    source,
+                    language=self.language,
+                    verbose=True,
+                    word_timestamps=False
+                )
 
-            # Save text transcript
+            # Save text transcript (built in memory, written with a single call)
             logger.info(f"Saving transcript to {output_path}...")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(f"Transcription - {audio_path.stem}\n")
-                f.write("=" * 70 + "\n\n")
-                f.write("FULL TRANSCRIPT:\n")
-                f.write("-" * 70 + "\n")
-                f.write(result["text"])
-                f.write("\n\n" + "=" * 70 + "\n\n")
+            segments = result.get("segments", [])
 
-                # Timestamped segments
-                f.write("TIMESTAMPED TRANSCRIPT:\n")
-                f.write("-" * 70 + "\n\n")
+            # Full text is rebuilt from the segments rather than kept as a second copy;
+            # _format_timestamp is inlined since this runs once per segment
+            text_parts = []
+            timestamped = []
+            for segment in segments:
+                text_parts.append(segment["text"])
+                hours, rest = divmod(int(segment["start"]), 3600)
+                timestamped.append("[%02d:%02d:%02d] %s\n" % (hours, rest // 60, rest % 60, segment["text"].strip()))
+
+            rule = "=" * 70
+            duration = result.get('duration', 0)
+            parts = [
+                f"Transcription - {audio_path.stem}\n",
+                rule + "\n\n",
+                "FULL TRANSCRIPT:\n",
+                "-" * 70 + "\n",
+                *text_parts,
+                "\n\n" + rule + "\n\n",
 
-                for segment in result.get("segments", []):
-                    timestamp = self._format_timestamp(segment["start"])
-                    text = segment["text"].strip()
-                    f.write(f"[{timestamp}] {text}\n")
+                # Timestamped segments
+                "TIMESTAMPED TRANSCRIPT:\n",
+                "-" * 70 + "\n\n",
+                *timestamped,
+                f"\nDuration: {self._format_timestamp(duration)}\n",
+                f"Segments: {len(segments)}\n",
+            ]
 
-                duration = result.get('duration', 0)
-                f.write(f"\nDuration: {self._format_timestamp(duration)}\n")
-                f.write(f"Segments: {len(result.get('segments', []))}\n")
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write("".join(parts))
 
             # Save JSON with full data
             if json_path:
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, ensure_ascii=False, indent=2)
+                self._write_json(result, json_path)
                 logger.info(f"✓ JSON data saved: {json_path}")
 
             logger.info(f"✓ Transcript saved: {output_path}")
             return result
 
+        except ImportError:
+            # A missing dependency is not a per-file failure
+            raise
         except Exception as e:
             logger.error(f"Transcription error: {e}")
             return {}
 
+    def _transcribe_faster(self, source) -> Dict:
+        """Transcribe a file path or samples with faster-whisper, returning a Whisper-style result dict"""
+        segments, info = self.model.transcribe(
+            source,
+            language=self.language,
+            vad_filter=True,
+            beam_size=1
+        )
+
+        # Segments are decoded lazily; log each one as it arrives like Whisper's verbose mode
+        result_segments = []
+        for segment in segments:
+            logger.info(f"[{self._format_timestamp(segment.start)}] {segment.text.strip()}")
+            result_segments.append({
+                'id': segment.id,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text
+            })
+
+        # No separate 'text' copy: the transcript writer joins the segments
+        return {
+            'segments': result_segments,
+            'language': info.language,
+            'duration': info.duration
+        }
+
+    def _transcribe_speech(self, samples) -> Dict:
+        """Transcribe only the speech found by webrtcvad, mapping timestamps back to the full audio"""
+        import numpy as np
+
+        regions = self._speech_regions(samples)
+        duration = len(samples) / SAMPLE_RATE
+        voiced = sum(end - start for start, end in regions) / SAMPLE_RATE
+        logger.info(f"Speech detected in {len(regions)} regions ({voiced:.0f}s of {duration:.0f}s)")
+
+        if not regions:
+            return {'segments': [], 'language': self.language, 'duration': duration}
+
+        # Speech is joined into one array and transcribed in a single call, so Whisper still
+        # fills its 30 s windows and keeps previous-text context across pauses.
+        # joined_starts[i] is where region i begins in the joined audio, in seconds.
+        joined_starts = []
+        shifts = []
+        pos = 0
+        for start, end in regions:
+            joined_starts.append(pos / SAMPLE_RATE)
+            shifts.append((start - pos) / SAMPLE_RATE)
+            pos += end - start
+        speech = np.concatenate([samples[start:end] for start, end in regions])
+
+        result = self.model.transcribe(
+            speech,
+            language=self.language,
+            verbose=None,
+            word_timestamps=False
+        )
+
+        segments = result.get('segments', [])
+        for segment in segments:
+            # An end that falls exactly on a join belongs to the region before it
+            segment['start'] += shifts[max(0, bisect_right(joined_starts, segment['start']) - 1)]
+            segment['end'] += shifts[max(0, bisect_left(joined_starts, segment['end']) - 1)]
+            logger.info(f"[{self._format_timestamp(segment['start'])}] {segment['text'].strip()}")
+
+        return {
+            'segments': segments,
+            'language': result.get('language', self.language),
+            'duration': duration
+        }
+
+    @staticmethod
+    def _speech_regions(samples) -> List[List[int]]:
+        """Sample ranges [start, end) holding speech, padded and merged where they overlap"""
+        import numpy as np
+
+        frame = SAMPLE_RATE * VAD_FRAME_MS // 1000
+        pad = SAMPLE_RATE * VAD_PADDING_MS // 1000
+        total = len(samples)
+
+        # webrtcvad takes 16-bit PCM bytes, two per sample
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+
+        regions = []
+        for pos in range(0, total - frame + 1, frame):
+            if not vad.is_speech(pcm[2 * pos:2 * (pos + frame)], SAMPLE_RATE):
+                continue
+            start, end = max(0, pos - pad), min(total, pos + frame + pad)
+            if regions and start <= regions[-1][1]:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+
+        return regions
+
+    @staticmethod
+    def _write_json(result: Dict, json_path: Path):
+        """Write the result as compact UTF-8 JSON, using orjson when installed"""
+        if orjson is not None:
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, separators=(',', ':'))
+
     @staticmethod
     def _format_timestamp(seconds: float) -> str:
         """Convert seconds to HH:MM:SS format"""